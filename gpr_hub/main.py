@@ -2,11 +2,15 @@ import os
 import sys
 import time
 import json
+import queue
+import threading
+import shutil
 import textwrap
+import warnings
+import zipfile
 import urllib.request
 import urllib.error
 from getpass import getpass
-import matplotlib.pyplot as plt
 import numpy as np
 from google import genai
 from google.genai import types
@@ -20,34 +24,105 @@ import requests
 
 version = "v5.0.0"
 
+# Update Check Config #
+UPDATE_CHECK_TIMEOUT = 3           # Seconds before giving up on GitHub
+UPDATE_CACHE_TTL = 24 * 60 * 60    # Seconds a cached release check stays fresh
+UPDATE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".gpr_hub", "update_check.json")
+
+update_results = queue.Queue()
+
+def load_update_cache():
+    """Reads the cached release check; anything malformed is treated as no cache or a stale one."""
+    try:
+        with open(UPDATE_CACHE_PATH, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or not isinstance(cache.get('tag_name'), str):
+        return {}
+    if not isinstance(cache.get('etag'), str):
+        cache.pop('etag', None)
+    checked_at = cache.get('checked_at')
+    if isinstance(checked_at, bool) or not isinstance(checked_at, (int, float)):
+        cache['checked_at'] = 0
+    return cache
+
+def save_update_cache(cache):
+    try:
+        os.makedirs(os.path.dirname(UPDATE_CACHE_PATH), exist_ok=True)
+        with open(UPDATE_CACHE_PATH, 'w') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
 def check_for_updates(current_version):
+    """
+    Finds the latest release tag, using the on-disk cache while it is fresh and
+    a conditional (ETag) request otherwise. The result is put on `update_results`
+    so the notice can be printed from the main thread.
+    """
     repo = "codemaster-ar/gpr-hub-cli"
     url = f"https://api.github.com/repos/{repo}/releases/latest"
-    
+    cache = load_update_cache()
+
+    if cache.get('tag_name') and time.time() - cache.get('checked_at', 0) < UPDATE_CACHE_TTL:
+        update_results.put((current_version, cache['tag_name'], None))
+        return
+
+    headers = {}
+    if cache.get('etag') and cache.get('tag_name'):
+        headers['If-None-Match'] = cache['etag']
+
     try:
         # Fetch the latest release data from GitHub
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an error for bad responses (4xx or 5xx)
-        
-        data = response.json()
-        latest_version = data['tag_name']
-        
-        # Comparison logic
-        if latest_version == current_version:
-            print(f"Success: (Version: {current_version})")
-            print ("\n")
+        response = requests.get(url, headers=headers, timeout=UPDATE_CHECK_TIMEOUT)
+        if response.status_code == 304:
+            # Release unchanged since the cached check
+            cache['checked_at'] = time.time()
         else:
-            print(f"{Fore.RED}{Style.BRIGHT}The current version of GPR HUB CLI you are using ({current_version}) is outdated. Please upgrade to the latest version ({latest_version}) for the best experience and to access new features.{Style.RESET_ALL}")
-            print(f"You can do this by running the following commands in your terminal:")
-            print(f"1. Brew update")
-            print(f"2. Brew upgrade{Style.RESET_ALL}")
-            # print(f"Download here: {data['html_url']}")
-            print("____________________________________________________\n")
-            # print("\n")
-            
-    except requests.exceptions.RequestException as e:
-        print(f"Error checking for updates: {e}")
+            response.raise_for_status()  # Raise an error for bad responses (4xx or 5xx)
+            data = response.json()
+            cache = {
+                'tag_name': data['tag_name'],
+                'etag': response.headers.get('ETag'),
+                'checked_at': time.time(),
+            }
+        save_update_cache(cache)
+        update_results.put((current_version, cache['tag_name'], None))
+
+    except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as e:
+        # Fall back to the last known release when offline
+        update_results.put((current_version, cache.get('tag_name'), e))
+
+def start_update_check(current_version):
+    """Runs the update check in the background so startup never waits on the network."""
+    thread = threading.Thread(target=check_for_updates, args=(current_version,), daemon=True)
+    thread.start()
+    return thread
+
+def show_update_notice():
+    """Prints the result of the background update check once it is ready."""
+    try:
+        current_version, latest_version, error = update_results.get_nowait()
+    except queue.Empty:
+        return
+
+    if latest_version is None:
+        print(f"Error checking for updates: {error}")
         print ("Try connecting to an internet, or if you already are, then try again later - it must be a server side issue.")
+        print ("\n")
+        return
+
+    # Comparison logic
+    if latest_version == current_version:
+        print(f"Success: (Version: {current_version})")
+        print ("\n")
+    else:
+        print(f"{Fore.RED}{Style.BRIGHT}The current version of GPR HUB CLI you are using ({current_version}) is outdated. Please upgrade to the latest version ({latest_version}) for the best experience and to access new features.{Style.RESET_ALL}")
+        print(f"You can do this by running the following commands in your terminal:")
+        print(f"1. Brew update")
+        print(f"2. Brew upgrade{Style.RESET_ALL}")
+        print("____________________________________________________\n")
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for package installation"""
@@ -158,8 +233,9 @@ def process_gpr_image(file_path):
         return None
         
     try:
-        # 1. Read the image into a NumPy array
-        img_data = plt.imread(file_path)
+        # 1. Read the image into a NumPy array (matplotlib.image does not pull in pyplot)
+        from matplotlib import image as mpimg
+        img_data = mpimg.imread(file_path)
         
         print(f"{Fore.GREEN}✅ Image loaded successfully from: {os.path.basename(file_path)}{Style.RESET_ALL}")
         print(f"Shape of the original data: {img_data.shape}")
@@ -186,11 +262,571 @@ def process_gpr_image(file_path):
         print(f"{Fore.RED}❌ An error occurred while reading the file: {e}{Style.RESET_ALL}")
         return None
 
+# --- Terminal Preview ---
+
+# Terminal Preview Config #
+SIXEL_TERMINALS = ('mlterm', 'foot', 'yaft', 'contour')
+SIXEL_TERM_PROGRAMS = ('WezTerm', 'iTerm.app', 'mintty')
+SIXEL_GREY_LEVELS = 12
+SIXEL_MAX_SIZE = (384, 768)  # Largest sixel image drawn, in pixels (height, width); keeps encoding fast
+
+def display_available():
+    """
+    Returns False when a plot window cannot be shown, or would be a slow
+    forwarded X11 window because we are running over SSH.
+    """
+    if os.environ.get('SSH_CONNECTION') or os.environ.get('SSH_TTY'):
+        return False
+    if sys.platform in ('win32', 'darwin'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+def terminal_supports_sixel():
+    if os.environ.get('GPR_HUB_SIXEL') in ('0', '1'):
+        return os.environ['GPR_HUB_SIXEL'] == '1'
+    term = os.environ.get('TERM', '')
+    return 'sixel' in term or term.startswith(SIXEL_TERMINALS) or os.environ.get('TERM_PROGRAM') in SIXEL_TERM_PROGRAMS
+
+def downsample_profile(gpr_array, rows, columns):
+    """
+    Shrinks a 2D profile to at most rows x columns by averaging whole blocks
+    of samples, then scales it to 0..1 using the 1st/99th percentiles.
+    """
+    data = np.asarray(gpr_array)
+    block_rows = max(1, -(-data.shape[0] // rows))
+    block_columns = max(1, -(-data.shape[1] // columns))
+    height = data.shape[0] // block_rows
+    width = data.shape[1] // block_columns
+    data = data[:height * block_rows, :width * block_columns]
+
+    # Add whole rows together first (long contiguous adds), then the column blocks
+    data = data.reshape(height, block_rows, width * block_columns).sum(axis=1, dtype=np.float32)
+    data = data.reshape(height, width, block_columns).sum(axis=2) / (block_rows * block_columns)
+
+    low, high = np.percentile(data, (1, 99))
+    if high <= low:
+        return np.zeros_like(data)
+    return np.clip((data - low) / (high - low), 0.0, 1.0)
+
+def render_half_blocks(levels, truecolor):
+    """
+    Draws a 0..1 array with '▀' characters: the foreground colour is the
+    upper pixel and the background colour the lower one, so each character
+    cell shows two rows.
+    """
+    if levels.shape[0] % 2:
+        levels = np.vstack((levels, levels[-1:]))
+    if truecolor:
+        grey = (levels * 255).astype(np.uint8)
+        foreground = [f"\033[38;2;{v};{v};{v}m" for v in range(256)]
+        background = [f"\033[48;2;{v};{v};{v}m" for v in range(256)]
+    else:
+        # The 256-colour palette has a 24 step grey ramp at 232-255
+        grey = (levels * 23).round().astype(np.uint8)
+        foreground = [f"\033[38;5;{232 + v}m" for v in range(24)]
+        background = [f"\033[48;5;{232 + v}m" for v in range(24)]
+
+    lines = []
+    for top, bottom in zip(grey[0::2].tolist(), grey[1::2].tolist()):
+        lines.append(''.join([foreground[t] + background[b] + '▀' for t, b in zip(top, bottom)]) + "\033[0m")
+    return '\n'.join(lines)
+
+def _decimal_digits(values):
+    """Number of decimal digits in each positive integer of `values`."""
+    return 1 + (values >= 10) + (values >= 100) + (values >= 1000) + (values >= 10000)
+
+def _write_decimal(out, positions, values):
+    """Writes each integer in `values` as ASCII digits into `out` at `positions`; returns the digit counts."""
+    digits = _decimal_digits(values)
+    for place in range(int(digits.max(initial=1))):
+        write = place < digits
+        power = 10 ** (digits[write] - 1 - place)
+        out[positions[write] + place] = 48 + (values[write] // power) % 10
+    return digits
+
+def _encode_sixel_rows(sixels, present):
+    """
+    Builds the sixel data for every band in one pass. `sixels` holds one
+    character per (band, colour, column) and `present` marks the colours
+    used in each band. Runs of 4+ equal characters become '!<count><char>'.
+    """
+    rows = sixels[present]
+    bands, colours = np.nonzero(present)
+    row_count, width = rows.shape
+    flat = rows.ravel()
+
+    # Runs of repeated characters, never spanning two rows
+    run_start = np.ones(flat.size, dtype=bool)
+    run_start[1:] = flat[1:] != flat[:-1]
+    run_start[::width] = True
+    run_start = np.flatnonzero(run_start)
+    run_length = np.diff(np.append(run_start, flat.size))
+    run_row = run_start // width
+    repeat = run_length >= 4
+
+    # Output size of every run and row ('#<colour>' + runs + '$' or '-'), then where each starts
+    run_size = np.where(repeat, 2 + _decimal_digits(run_length), run_length)
+    prefix_size = 1 + _decimal_digits(colours)
+    row_size = prefix_size + np.bincount(run_row, weights=run_size, minlength=row_count).astype(np.int64) + 1
+    row_offset = np.concatenate(([0], np.cumsum(row_size)[:-1]))
+    run_cumsum = np.concatenate(([0], np.cumsum(run_size)[:-1]))
+    first_run = np.searchsorted(run_start, np.arange(row_count) * width)
+    run_offset = row_offset[run_row] + prefix_size[run_row] + run_cumsum - run_cumsum[first_run][run_row]
+
+    out = np.empty(int(row_size.sum()), dtype=np.uint8)
+    out[row_offset] = ord('#')
+    _write_decimal(out, row_offset + 1, colours)
+    last_in_band = np.append(bands[1:] != bands[:-1], True)
+    out[row_offset + row_size - 1] = np.where(last_in_band, ord('-'), ord('$'))
+
+    repeat_offset = run_offset[repeat]
+    out[repeat_offset] = ord('!')
+    count_digits = _write_decimal(out, repeat_offset + 1, run_length[repeat])
+    out[repeat_offset + 1 + count_digits] = flat[run_start[repeat]]
+
+    # Shorter runs are copied character by character
+    char_run = np.repeat(np.arange(len(run_start)), run_length)
+    literal = np.flatnonzero(~repeat[char_run])
+    literal_run = char_run[literal]
+    out[run_offset[literal_run] + literal - run_start[literal_run]] = flat[literal]
+    return out.tobytes().decode('ascii')
+
+def render_sixel(levels):
+    """Encodes a 0..1 array as a grey-scale sixel image."""
+    palette_size = SIXEL_GREY_LEVELS
+    pixels = (levels * (palette_size - 1)).round().astype(np.uint8)
+    if pixels.shape[0] % 6:
+        pad = 6 - pixels.shape[0] % 6
+        pixels = np.vstack((pixels, np.repeat(pixels[-1:], pad, axis=0)))
+
+    out = ['\033Pq', f'"1;1;{pixels.shape[1]};{pixels.shape[0]}']
+    for colour in range(palette_size):
+        percent = round(100 * colour / (palette_size - 1))
+        out.append(f"#{colour};2;{percent};{percent};{percent}")
+
+    # For every 6-row band and colour, one sixel character per column where
+    # bit n is set when row n of the band has that colour
+    bands = pixels.reshape(-1, 6, pixels.shape[1])
+    colours = np.arange(palette_size, dtype=np.uint8)
+    matches = bands[:, None, :, :] == colours[None, :, None, None]
+    bit_weights = (1 << np.arange(6, dtype=np.uint8))[None, None, :, None]
+    sixels = (matches * bit_weights).sum(axis=2, dtype=np.uint8) + 63
+    present = matches.any(axis=(2, 3))
+
+    out.append(_encode_sixel_rows(sixels, present))
+    out.append('\033\\')
+    return ''.join(out)
+
+def preview_gpr_profile(gpr_array, title="GPR Profile"):
+    """Draws a GPR profile directly in the terminal, without opening a plot window."""
+    if gpr_array.size == 0:
+        print(f"{Fore.YELLOW}⚠️ {title} has no data to preview.{Style.RESET_ALL}")
+        return
+
+    size = shutil.get_terminal_size((100, 30))
+    rows = max(4, size.lines - 4)
+    columns = max(10, size.columns)
+
+    print(f"{Style.BRIGHT}{title}{Style.RESET_ALL} ({gpr_array.shape[1]} traces x {gpr_array.shape[0]} samples)")
+    if terminal_supports_sixel():
+        # Assume roughly 8x16 pixel character cells
+        levels = downsample_profile(gpr_array, min(rows * 16, SIXEL_MAX_SIZE[0]), min(columns * 8, SIXEL_MAX_SIZE[1]))
+        sys.stdout.write(render_sixel(levels) + "\n")
+    else:
+        truecolor = os.environ.get('COLORTERM', '').lower() in ('truecolor', '24bit')
+        levels = downsample_profile(gpr_array, rows * 2, columns)
+        sys.stdout.write(render_half_blocks(levels, truecolor) + "\n")
+    sys.stdout.flush()
+
+# --- Live Acquisition Mode ---
+
+# Live Config #
+LIVE_FPS = 10              # Display refresh rate (frames per second)
+LIVE_WINDOW_TRACES = 600   # Number of traces kept in the scrolling display
+LIVE_BACKGROUND_ALPHA = 0.02  # Weight of each new trace in the running background estimate
+LIVE_CLIM_DECAY = 0.9      # How much of the previous colour scale is kept on each update
+LIVE_SAMPLE_TYPES = ("uint8", "uint16", "int16", "int32", "float32")
+
+def read_new_traces(f, offset, samples_per_trace, dtype):
+    """
+    Reads only the complete traces appended to the open file since `offset`.
+    Returns the new traces as a (samples, traces) array and the updated offset.
+    """
+    trace_bytes = samples_per_trace * dtype.itemsize
+    file_size = os.fstat(f.fileno()).st_size
+    new_traces = (file_size - offset) // trace_bytes
+    if new_traces <= 0:
+        return None, offset
+
+    f.seek(offset)
+    raw = f.read(new_traces * trace_bytes)
+    new_traces = len(raw) // trace_bytes
+    if new_traces == 0:
+        return None, offset
+
+    block = np.frombuffer(raw[:new_traces * trace_bytes], dtype=dtype)
+    block = block.reshape(new_traces, samples_per_trace).T.astype(np.float32)
+    return block, offset + new_traces * trace_bytes
+
+def process_trace_block(block, background, gain_curve, seed_background=False):
+    """
+    Runs the processing stages on a block of new traces only.
+    Dewow and gain are trace-local; background removal uses a running
+    average, so `background` is updated in place and carried between blocks.
+    Pass `seed_background=True` for the first block so it starts from that
+    block's own average instead of zeros.
+    """
+    # 1. Dewow: remove the DC/low-frequency offset of each trace
+    block = block - block.mean(axis=0, keepdims=True)
+
+    # 2. Background removal against the running average of earlier traces
+    if seed_background:
+        background[:] = block.mean(axis=1)
+    processed = block - background[:, None]
+    weight = 1.0 - (1.0 - LIVE_BACKGROUND_ALPHA) ** block.shape[1]
+    background += weight * (block.mean(axis=1) - background)
+
+    # 3. Time-varying gain to compensate for attenuation with depth
+    processed *= gain_curve[:, None]
+    return processed
+
+def live_gpr_run():
+    """Watches a growing raw GPR data file and displays new traces as they are recorded."""
+    if not display_available():
+        print(f"{Fore.RED}❌ The live viewer needs a graphical display. Use 'preview' in open_gpr to view profiles over SSH.{Style.RESET_ALL}")
+        return
+
+    import matplotlib.pyplot as plt
+
+    print("Live GPR Acquisition Viewer:")
+    print("The data file must contain raw traces, one after another (e.g. a .DZT file still being recorded).")
+    file_path = input("Please enter the full path to the data file being recorded: ").strip().replace('"', '').replace("'", '')
+    if not os.path.exists(file_path):
+        print(f"{Fore.RED}❌ Error: File not found at path: {file_path}{Style.RESET_ALL}")
+        return
+
+    try:
+        samples_per_trace = int(input("Samples per trace (e.g. 512): ").strip() or "512")
+        dtype_name = input(f"Sample data type - {', '.join(LIVE_SAMPLE_TYPES)} (default uint16, as in 16-bit GSSI .DZT files): ").strip().lower() or "uint16"
+        header_bytes = int(input("Header size in bytes (default 0, GSSI .DZT files use 1024): ").strip() or "0")
+    except ValueError as e:
+        print(f"{Fore.RED}❌ Invalid setting: {e}{Style.RESET_ALL}")
+        return
+    if samples_per_trace <= 0 or header_bytes < 0 or dtype_name not in LIVE_SAMPLE_TYPES:
+        print(f"{Fore.RED}❌ Invalid setting: samples per trace must be positive, the header size cannot be negative and the data type must be one of {', '.join(LIVE_SAMPLE_TYPES)}.{Style.RESET_ALL}")
+        return
+    dtype = np.dtype(dtype_name)
+
+    trace_bytes = samples_per_trace * dtype.itemsize
+    window = LIVE_WINDOW_TRACES
+
+    # Ring buffer holding the most recent traces, written in place
+    ring = np.zeros((samples_per_trace, window), dtype=np.float32)
+    write_pos = 0
+    total_traces = 0
+    background = np.zeros(samples_per_trace, dtype=np.float32)
+    gain_curve = np.linspace(1.0, 10.0, samples_per_trace, dtype=np.float32) ** 1.5
+    clim = 1e-6
+
+    # Start from the most recent window of traces instead of the whole file
+    file_size = os.path.getsize(file_path)
+    existing_traces = max(0, (file_size - header_bytes) // trace_bytes)
+    offset = header_bytes + max(0, existing_traces - window) * trace_bytes
+
+    plt.ion()
+    fig, ax = plt.subplots()
+    image = ax.imshow(ring, cmap='gray', aspect='auto', vmin=-clim, vmax=clim)
+    ax.set_title("Live GPR Profile")
+    ax.set_xlabel("Most recent traces")
+    ax.set_ylabel("Depth/Time Axis (Samples)")
+    plt.show(block=False)
+
+    print(f"{Fore.GREEN}✅ Watching {os.path.basename(file_path)} - close the window or press Ctrl+C to stop.{Style.RESET_ALL}")
+    frame_time = 1.0 / LIVE_FPS
+    try:
+        with open(file_path, 'rb') as f:
+            while plt.fignum_exists(fig.number):
+                frame_start = time.monotonic()
+
+                # Recording restarted or file truncated: start over
+                if os.fstat(f.fileno()).st_size < offset:
+                    offset = header_bytes
+                    ring[:] = 0
+                    write_pos = 0
+                    total_traces = 0
+
+                block, offset = read_new_traces(f, offset, samples_per_trace, dtype)
+                if block is not None:
+                    processed = process_trace_block(block, background, gain_curve, seed_background=(total_traces == 0))[:, -window:]
+                    count = processed.shape[1]
+                    columns = (write_pos + np.arange(count)) % window
+                    ring[:, columns] = processed
+                    write_pos = (write_pos + count) % window
+                    # Colour scale follows a decaying estimate of recent amplitudes
+                    block_clim = max(1e-6, float(np.percentile(np.abs(processed), 99)))
+                    clim = block_clim if total_traces == 0 else LIVE_CLIM_DECAY * clim + (1 - LIVE_CLIM_DECAY) * block_clim
+                    total_traces += block.shape[1]
+                    # Oldest trace on the left, newest on the right
+                    image.set_data(np.concatenate((ring[:, write_pos:], ring[:, :write_pos]), axis=1))
+                    image.set_clim(-clim, clim)
+                    ax.set_title(f"Live GPR Profile ({total_traces} traces)")
+                    fig.canvas.draw_idle()
+
+                plt.pause(max(0.001, frame_time - (time.monotonic() - frame_start)))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"{Fore.RED}❌ An error occurred while reading the file: {e}{Style.RESET_ALL}")
+    finally:
+        plt.close(fig)
+        plt.ioff()
+    print("Exiting Live GPR Viewer.")
+
+# --- Survey Spatial Index ---
+
+# Survey Index Config #
+SURVEY_INDEX_FILE = "gpr_survey_index.npz"
+SURVEY_INDEX_CELL_SIZE = 5.0   # Grid cell size in metres
+SURVEY_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+SURVEY_GOTO_MARGIN_TRACES = 50  # Traces shown either side of a match
+SURVEY_INDEX_KEYS = ('x', 'y', 'trace', 'line', 'line_order', 'line_rank', 'max_step', 'paths', 'origin', 'cell_size', 'grid_shape', 'cell_keys', 'cell_starts')
+
+def load_trace_coordinates(csv_path):
+    """
+    Reads the per-trace positions of one GPR line from its sidecar CSV file.
+    Each row is 'trace,x,y' with x/y in metres (e.g. UTM easting/northing);
+    a header row is skipped automatically.
+    """
+    with open(csv_path, 'r') as f:
+        first_line = f.readline()
+    try:
+        # A header row is one whose fields are not numbers (exponents like 5.0001e5 are fine)
+        [float(field) for field in first_line.split(',') if field.strip()]
+        skip_header = 0
+    except ValueError:
+        skip_header = 1
+    with warnings.catch_warnings():
+        # genfromtxt warns about empty files; they are handled below
+        warnings.simplefilter('ignore', UserWarning)
+        data = np.genfromtxt(csv_path, delimiter=',', skip_header=skip_header, ndmin=2)
+    if data.ndim != 2 or data.shape[1] < 3:
+        # No position rows yet (e.g. a GPS log that has only just been created)
+        empty = np.empty(0)
+        return empty.astype(np.int32), empty, empty
+    data = data[:, :3]
+    data = data[~np.isnan(data).any(axis=1)]
+    return data[:, 0].astype(np.int32), data[:, 1], data[:, 2]
+
+def survey_line_files(folder):
+    """Returns (image path, position CSV path) for every GPR image in `folder` that has a sidecar '<name>.csv' file."""
+    line_files = []
+    for name in sorted(os.listdir(folder)):
+        base, ext = os.path.splitext(name)
+        csv_path = os.path.join(folder, base + '.csv')
+        if ext.lower() in SURVEY_IMAGE_EXTENSIONS and os.path.exists(csv_path):
+            line_files.append((os.path.abspath(os.path.join(folder, name)), csv_path))
+    return line_files
+
+def build_survey_index(folder, cell_size=SURVEY_INDEX_CELL_SIZE):
+    """
+    Collects the trace positions of every GPR image in `folder` that has a
+    sidecar '<name>.csv' file into flat arrays, sorted by grid cell so that
+    each cell's traces are one contiguous slice.
+    """
+    paths, xs, ys, traces, lines = [], [], [], [], []
+    for image_path, csv_path in survey_line_files(folder):
+        try:
+            trace, x, y = load_trace_coordinates(csv_path)
+        except (OSError, ValueError, IndexError) as e:
+            print(f"{Fore.YELLOW}⚠️ Skipping {os.path.basename(image_path)}: could not read positions ({e}){Style.RESET_ALL}")
+            continue
+        if len(trace) == 0:
+            continue
+        lines.append(np.full(len(trace), len(paths), dtype=np.int32))
+        paths.append(image_path)
+        traces.append(trace)
+        xs.append(x)
+        ys.append(y)
+
+    if not paths:
+        return None
+
+    x = np.concatenate(xs)
+    y = np.concatenate(ys)
+    origin = np.array([x.min(), y.min()])
+    cx = ((x - origin[0]) // cell_size).astype(np.int64)
+    cy = ((y - origin[1]) // cell_size).astype(np.int64)
+    grid_rows = int(cy.max()) + 1
+    cell = cx * grid_rows + cy
+    order = np.argsort(cell, kind='stable')
+    cell_keys, cell_starts = np.unique(cell[order], return_index=True)
+    x, y = x[order], y[order]
+    trace = np.concatenate(traces)[order]
+    line = np.concatenate(lines)[order]
+
+    # Walking order of each line (by trace number) so a trace's neighbours can be
+    # found from its cell-sorted position: line_order[line_rank[i] + 1]
+    line_order = np.lexsort((trace, line))
+    line_rank = np.empty_like(line_order)
+    line_rank[line_order] = np.arange(len(line_order))
+    same_line = line[line_order[1:]] == line[line_order[:-1]]
+    steps = np.hypot(np.diff(x[line_order]), np.diff(y[line_order]))[same_line]
+
+    return {
+        'x': x,
+        'y': y,
+        'trace': trace,
+        'line': line,
+        'line_order': line_order,
+        'line_rank': line_rank,
+        'max_step': np.float64(steps.max() if len(steps) else 0.0),
+        'paths': np.array(paths),
+        'origin': origin,
+        'cell_size': np.float64(cell_size),
+        'grid_shape': np.array([int(cx.max()) + 1, grid_rows]),
+        'cell_keys': cell_keys,
+        'cell_starts': np.append(cell_starts, len(cell)),
+    }
+
+def save_survey_index(index, path):
+    np.savez(path, **index)
+
+def load_survey_index(path):
+    """Loads a saved survey index, raising ValueError if the file is unreadable or incomplete."""
+    try:
+        with np.load(path) as data:
+            index = {key: data[key] for key in data.files}
+    except (EOFError, zipfile.BadZipFile) as e:
+        raise ValueError(f"corrupt survey index: {e}")
+    missing = [key for key in SURVEY_INDEX_KEYS if key not in index]
+    if missing:
+        raise ValueError(f"survey index is missing {', '.join(missing)}")
+    return index
+
+def _survey_index_candidates(index, xmin, ymin, xmax, ymax):
+    """Returns the positions of all indexed traces in grid cells overlapping the bounding box."""
+    origin, cell_size = index['origin'], float(index['cell_size'])
+    columns, rows = (int(n) for n in index['grid_shape'])
+    cx0 = max(0, int((xmin - origin[0]) // cell_size))
+    cx1 = min(columns - 1, int((xmax - origin[0]) // cell_size))
+    cy0 = max(0, int((ymin - origin[1]) // cell_size))
+    cy1 = min(rows - 1, int((ymax - origin[1]) // cell_size))
+    if cx0 > cx1 or cy0 > cy1:
+        return np.empty(0, dtype=np.int64)
+
+    # Within one grid column the cells of the box have consecutive keys,
+    # so each column is a single slice of the cell-sorted arrays.
+    column_keys = np.arange(cx0, cx1 + 1, dtype=np.int64) * rows
+    first = np.searchsorted(index['cell_keys'], column_keys + cy0, side='left')
+    last = np.searchsorted(index['cell_keys'], column_keys + cy1, side='right')
+    starts = index['cell_starts'][first]
+    stops = index['cell_starts'][last]
+    if not np.any(stops > starts):
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate([np.arange(a, b) for a, b in zip(starts, stops) if b > a])
+
+def query_traces_near(index, x, y, radius):
+    """Returns the positions of all indexed traces within `radius` metres of (x, y), nearest first."""
+    candidates = _survey_index_candidates(index, x - radius, y - radius, x + radius, y + radius)
+    dist_sq = (index['x'][candidates] - x) ** 2 + (index['y'][candidates] - y) ** 2
+    within = dist_sq <= radius * radius
+    return candidates[within][np.argsort(dist_sq[within], kind='stable')]
+
+def _segments_cross(ax, ay, bx, by, cx, cy, dx, dy):
+    """Vectorised test of whether segments a-b cross (or touch) segments c-d."""
+    def orientation(px, py, qx, qy, rx, ry):
+        return np.sign((qx - px) * (ry - py) - (qy - py) * (rx - px))
+    o1 = orientation(ax, ay, bx, by, cx, cy)
+    o2 = orientation(ax, ay, bx, by, dx, dy)
+    o3 = orientation(cx, cy, dx, dy, ax, ay)
+    o4 = orientation(cx, cy, dx, dy, bx, by)
+    crossing = (o1 * o2 <= 0) & (o3 * o4 <= 0)
+    # Collinear segments only count when their extents overlap
+    collinear = (o1 == 0) & (o2 == 0)
+    overlap = ((np.minimum(ax, bx) <= np.maximum(cx, dx)) & (np.minimum(cx, dx) <= np.maximum(ax, bx)) &
+               (np.minimum(ay, by) <= np.maximum(cy, dy)) & (np.minimum(cy, dy) <= np.maximum(ay, by)))
+    return crossing & (~collinear | overlap)
+
+def query_traces_in_polygon(index, polygon):
+    """
+    Returns the positions of all indexed traces inside `polygon`, a list of
+    (x, y) vertices, plus both ends of every trace-to-trace step that crosses
+    its boundary, so lines passing between two traces are found too.
+    """
+    polygon = np.asarray(polygon, dtype=np.float64)
+    # Widen the box by the longest step so steps that start outside it are still tested
+    reach = float(index['max_step'])
+    low, high = polygon.min(axis=0) - reach, polygon.max(axis=0) + reach
+    candidates = _survey_index_candidates(index, low[0], low[1], high[0], high[1])
+    px, py = index['x'][candidates], index['y'][candidates]
+
+    # Ray casting: count the polygon edges crossed by a ray towards +x
+    inside = np.zeros(len(candidates), dtype=bool)
+    x1, y1 = polygon[:, 0], polygon[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    for ax, ay, bx, by in zip(x1, y1, x2, y2):
+        crosses = (ay > py) != (by > py)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = ax + (py - ay) * (bx - ax) / (by - ay)
+        inside ^= crosses & (px < x_cross)
+
+    # Steps from each candidate trace to the next trace along its line
+    next_rank = index['line_rank'][candidates] + 1
+    has_next = next_rank < len(index['line_order'])
+    starts = candidates[has_next]
+    ends = index['line_order'][next_rank[has_next]]
+    same_line = index['line'][ends] == index['line'][starts]
+    starts, ends = starts[same_line], ends[same_line]
+
+    crossing = np.zeros(len(starts), dtype=bool)
+    sx, sy, ex, ey = index['x'][starts], index['y'][starts], index['x'][ends], index['y'][ends]
+    for ax, ay, bx, by in zip(x1, y1, x2, y2):
+        crossing |= _segments_cross(sx, sy, ex, ey, ax, ay, bx, by)
+
+    matches = np.concatenate((candidates[inside], starts[crossing], ends[crossing]))
+    return np.unique(matches)
+
+def summarize_survey_matches(index, matches):
+    """
+    Groups matching traces by line, returning (path, first trace, last trace, count)
+    per line in the order the lines first appear in `matches`.
+    """
+    summary = []
+    lines = index['line'][matches]
+    unique_lines, first_seen = np.unique(lines, return_index=True)
+    for line in unique_lines[np.argsort(first_seen)]:
+        line_traces = index['trace'][matches[lines == line]]
+        summary.append((str(index['paths'][line]), int(line_traces.min()), int(line_traces.max()), len(line_traces)))
+    return summary
+
+def show_gpr_profile(gpr_array, title, first_trace=0):
+    """
+    Displays a GPR profile; `first_trace` labels the distance axis when showing part of a line.
+    Falls back to a terminal preview when no plot window can be opened.
+    """
+    if not display_available():
+        if first_trace:
+            title = f"{title} - from trace {first_trace}"
+        preview_gpr_profile(gpr_array, title)
+        return
+
+    import matplotlib.pyplot as plt
+    plt.figure()
+    extent = (first_trace - 0.5, first_trace + gpr_array.shape[1] - 0.5, gpr_array.shape[0] - 0.5, -0.5)
+    plt.imshow(gpr_array, cmap='gray', aspect='auto', extent=extent)
+    plt.title(title)
+    plt.xlabel("Distance Axis (Pixels)")
+    plt.ylabel("Depth/Time Axis (Pixels)")
+    plt.colorbar(label='Amplitude/Intensity')
+    plt.show()
+
 # --- Main Script Loop ---
 
 def gpr_reader_cli_run():
     """Main command-line interface for the GPR reader."""
     gpr_array = None
+    survey_index = None
+    survey_matches = []
     
     print("Welcome to the GPR Image Reader.")
     print("Type 'upload <file_path>' to load an image, or 'exit' to quit.")
@@ -198,6 +834,11 @@ def gpr_reader_cli_run():
     print("\n💡 **Examples:**")
     print("   Windows: upload C:\\Data\\profile.png")
     print("   Linux/macOS: upload /home/user/data/profile.png")
+    print("   Over SSH: preview /home/user/data/profile.png (draws the profile in this terminal)")
+    print("\n📍 **Survey search** (positions in metres, from a '<name>.csv' file next to each image):")
+    print("   index /home/user/data/survey       - Index every line in a folder")
+    print("   near 512340.5 4182210.0 2          - Find traces within 2 m of a point")
+    print("   within 0,0 10,0 10,10 0,10         - Find lines crossing a polygon")
     
     while True:
         user_input = input("\n> ").strip()
@@ -226,13 +867,106 @@ def gpr_reader_cli_run():
                 print("\n**Image successfully loaded and processed.**")
                 
                 # Show the result for confirmation
-                plt.figure()
-                plt.imshow(gpr_array, cmap='gray', aspect='auto')
-                plt.title("Loaded GPR Profile (Intensity)")
-                plt.xlabel("Distance Axis (Pixels)")
-                plt.ylabel("Depth/Time Axis (Pixels)")
-                plt.colorbar(label='Amplitude/Intensity')
-                plt.show()
+                show_gpr_profile(gpr_array, "Loaded GPR Profile (Intensity)")
+            continue
+
+        # 3. Handle the 'preview <file_path>' command (draws in the terminal, no plot window)
+        if user_input.lower().startswith('preview '):
+            file_path = user_input.split(maxsplit=1)[1].strip().replace('"', '').replace("'", '')
+            gpr_array = process_gpr_image(file_path)
+            if gpr_array is not None:
+                preview_gpr_profile(gpr_array, os.path.basename(file_path))
+            continue
+
+        # 4. Handle the 'index <folder>' command
+        if user_input.lower().startswith('index '):
+            folder = user_input.split(maxsplit=1)[1].strip().replace('"', '').replace("'", '')
+            if not os.path.isdir(folder):
+                print(f"{Fore.RED}❌ Error: Folder not found at path: {folder}{Style.RESET_ALL}")
+                continue
+
+            # Reuse the saved index unless a line was added, removed or changed since it was built
+            index_path = os.path.join(folder, SURVEY_INDEX_FILE)
+            line_files = survey_line_files(folder)
+            newest_change = max((os.path.getmtime(path) for line in line_files for path in line), default=0)
+            if os.path.exists(index_path) and os.path.getmtime(index_path) >= newest_change:
+                try:
+                    saved_index = load_survey_index(index_path)
+                except (OSError, ValueError) as e:
+                    print(f"{Fore.YELLOW}⚠️ Could not read the saved index ({e}), rebuilding it.{Style.RESET_ALL}")
+                    saved_index = None
+                if saved_index is not None and set(saved_index['paths'].tolist()) == {image_path for image_path, _ in line_files}:
+                    survey_index = saved_index
+                    print(f"{Fore.GREEN}✅ Loaded index of {len(survey_index['x'])} traces from {len(survey_index['paths'])} lines.{Style.RESET_ALL}")
+                    continue
+
+            survey_index = build_survey_index(folder)
+            if survey_index is None:
+                print("⚠️ No GPR images with a matching '<name>.csv' position file were found in that folder.")
+                continue
+            try:
+                save_survey_index(survey_index, index_path)
+                print(f"{Fore.GREEN}✅ Indexed {len(survey_index['x'])} traces from {len(survey_index['paths'])} lines (saved to {index_path}).{Style.RESET_ALL}")
+            except OSError as e:
+                print(f"{Fore.GREEN}✅ Indexed {len(survey_index['x'])} traces from {len(survey_index['paths'])} lines.{Style.RESET_ALL}")
+                print(f"{Fore.YELLOW}⚠️ Could not save the index to {index_path} ({e}); it will be rebuilt next time.{Style.RESET_ALL}")
+            continue
+
+        # 5. Handle the 'near <x> <y> [radius]' and 'within <x,y> <x,y> <x,y> ...' queries
+        if user_input.lower().startswith(('near ', 'within ')):
+            if survey_index is None:
+                print("⚠️ No survey index loaded. Type 'index <folder>' first.")
+                continue
+
+            command, _, arguments = user_input.partition(' ')
+            try:
+                if command.lower() == 'near':
+                    values = [float(v) for v in arguments.split()]
+                    if len(values) not in (2, 3):
+                        raise ValueError("expected 'near <x> <y> [radius]'")
+                    radius = values[2] if len(values) == 3 else 2.0
+                    matches = query_traces_near(survey_index, values[0], values[1], radius)
+                else:
+                    polygon = [tuple(float(v) for v in vertex.split(',')) for vertex in arguments.split()]
+                    if len(polygon) < 3 or any(len(vertex) != 2 for vertex in polygon):
+                        raise ValueError("expected at least three 'x,y' vertices")
+                    matches = query_traces_in_polygon(survey_index, polygon)
+            except ValueError as e:
+                print(f"⚠️ Invalid query: {e}")
+                continue
+
+            survey_matches = summarize_survey_matches(survey_index, matches)
+            if not survey_matches:
+                print("No traces found in that area.")
+                continue
+            print(f"Found {len(matches)} traces on {len(survey_matches)} lines:")
+            for number, (path, first, last, count) in enumerate(survey_matches, start=1):
+                print(f"  {number}. {os.path.basename(path)} - traces {first} to {last} ({count} matching)")
+            print("Type 'goto <number>' to open that line at the matching traces.")
+            continue
+
+        # 6. Handle the 'goto <number>' command
+        if user_input.lower().startswith('goto '):
+            try:
+                path, first, last, _ = survey_matches[int(user_input.split()[1]) - 1]
+            except (ValueError, IndexError):
+                print("⚠️ Please provide the number of a line from the last 'near' or 'within' query.")
+                continue
+
+            gpr_array = process_gpr_image(path)
+            if gpr_array is not None:
+                # Trace numbers come from the CSV; make sure they fall inside the image
+                width = gpr_array.shape[1]
+                if first >= width or last < 0:
+                    print(f"{Fore.YELLOW}⚠️ Traces {first}-{last} are outside {os.path.basename(path)}, which is only {width} traces wide. Check that the CSV trace numbers match the image columns.{Style.RESET_ALL}")
+                    continue
+
+                # Show the matching traces with some context on either side
+                margin = SURVEY_GOTO_MARGIN_TRACES
+                first, last = max(0, first), min(width - 1, last)
+                start = max(0, first - margin)
+                stop = min(width, last + margin + 1)
+                show_gpr_profile(gpr_array[:, start:stop], f"{os.path.basename(path)} (traces {first}-{last})", first_trace=start)
                 
 
 
@@ -484,13 +1218,15 @@ def start_chat_gemini():
 
 # --- Main Menu Loop ---
 def main():
+    start_update_check(version)
     gate = KeyboardGate()
     gate.KeyboardGateDisable()
     print_ascii_art()
     loading_bar(total_seconds=1)
-    check_for_updates(version)
+    show_update_notice()
     gate.KeyboardGateEnable()
     while True:
+        show_update_notice()
         try:
             user_input_terminal = ("")
             user_input_terminal = input("Enter 'commands' to obtain functional commands (or Ctrl+C to stop): ").strip().lower()
@@ -513,6 +1249,8 @@ def main():
             cinetext_type(text, 0.0005)
             text = (f"{Fore.GREEN}read_gpr{Style.RESET_ALL}       - Read and process GPR files.")
             cinetext_type(text, 0.0005)
+            text = (f"{Fore.GREEN}live_gpr{Style.RESET_ALL}       - View a GPR data file live while it is still being recorded.")
+            cinetext_type(text, 0.0005)
             text = (f"{Fore.GREEN}exit{Style.RESET_ALL}           - Exit the GPR Reader Python edition.")
             cinetext_type(text, 0.0005)
             text = (f"{Fore.GREEN}commands{Style.RESET_ALL}       - Display this message with available commands.")
@@ -635,6 +1373,8 @@ def main():
         elif user_input_terminal == "open_gpr":
             gpr_reader_cli_run()
             break
+        elif user_input_terminal == "live_gpr":
+            live_gpr_run()
         elif user_input_terminal == "gemini_gpr":
             gemini_image_reader()
         elif user_input_terminal == "clear":